@@ -10,19 +10,42 @@ minimal environments. It supports:
 from __future__ import annotations
 
 import argparse
+import bisect
 import csv
+import heapq
 import json
 import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 
 def _read_csv(path: Path) -> list[dict[str, str]]:
+    # csv.reader + zip avoids csv.DictReader's per-row Python overhead
     with path.open("r", newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
-
-
-def _write_csv(path: Path, rows: list[dict[str, Any]], fieldnames: list[str]) -> None:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        width = len(header)
+        rows = []
+        for rec in reader:
+            row = dict(zip(header, rec))
+            if len(rec) != width:
+                # same as csv.DictReader: skip blank lines, pad short rows with None and
+                # keep extra fields as a list under the None key
+                if not rec:
+                    continue
+                if len(rec) < width:
+                    row.update(dict.fromkeys(header[len(rec) :]))
+                else:
+                    row[None] = rec[width:]
+            rows.append(row)
+        return rows
+
+
+def _write_csv(path: Path, rows: Iterable[dict[str, Any]], fieldnames: list[str]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -39,6 +62,13 @@ def _validate_columns(rows: list[dict[str, str]], required: list[str]) -> None:
         raise ValueError(f"Missing required columns: {missing}")
 
 
+_KDTREE_LEAF_SIZE = 16
+_KDTREE_MIN_POINTS = 64
+# chord length on the unit sphere (~6 um on the ground): far above the rounding error of
+# either distance formula, far below any real spacing between distinct points
+_TIE_TOLERANCE = 1e-12
+
+
 def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     r = 6371.0088
     phi1, phi2 = math.radians(lat1), math.radians(lat2)
@@ -48,18 +78,132 @@ def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return 2 * r * math.asin(math.sqrt(a))
 
 
+def _widen(d2: float) -> float:
+    # squared chord distance grown by _TIE_TOLERANCE, the cutoff for near-tie candidates
+    return (math.sqrt(d2) + _TIE_TOLERANCE) ** 2
+
+
+def _pick_neighbors(i: int, candidates: list[int], k: int, lats: list[float], lons: list[float]) -> list[int]:
+    # candidates are every point within _TIE_TOLERANCE of the k-th nearest chord
+    # distance. Chord and haversine round differently, so equidistant points (e.g. on a
+    # snapped grid) can swap order; re-rank near-ties with the haversine distance and
+    # lowest index, exactly as a stable haversine sort would.
+    if len(candidates) <= k:
+        return candidates
+    lat_i, lon_i = lats[i], lons[i]
+    return heapq.nsmallest(
+        k, sorted(candidates), key=lambda j: _haversine_km(lat_i, lon_i, lats[j], lons[j])
+    )
+
+
+def _unit_vectors(lat_r: list[float], lon_r: list[float]) -> list[tuple[float, float, float]]:
+    # Euclidean (chord) distance between unit vectors is monotonic in great-circle
+    # distance, so ranking by it gives exactly the haversine nearest neighbors.
+    out = []
+    for phi, lam in zip(lat_r, lon_r):
+        cos_phi = math.cos(phi)
+        out.append((cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi)))
+    return out
+
+
+def _brute_knn(
+    xyz: list[tuple[float, float, float]], k: int, lats: list[float], lons: list[float]
+) -> list[list[int]]:
+    neighbors = []
+    for i, (xi, yi, zi) in enumerate(xyz):
+        d2 = [(x - xi) ** 2 + (y - yi) ** 2 + (z - zi) ** 2 for x, y, z in xyz]
+        limit = _widen(heapq.nsmallest(k, d2)[-1])
+        candidates = [j for j, d in enumerate(d2) if d <= limit]
+        neighbors.append(_pick_neighbors(i, candidates, k, lats, lons))
+    return neighbors
+
+
+def _build_kdtree(items: list[tuple[int, float, float, float]]) -> Any:
+    # leaves are lists of (index, x, y, z); inner nodes are (axis, split, left, right)
+    if len(items) <= _KDTREE_LEAF_SIZE:
+        return items
+    spreads = [max(it[a] for it in items) - min(it[a] for it in items) for a in (1, 2, 3)]
+    axis = spreads.index(max(spreads)) + 1
+    items.sort(key=lambda it: it[axis])
+    mid = len(items) // 2
+    return (axis, items[mid][axis], _build_kdtree(items[:mid]), _build_kdtree(items[mid:]))
+
+
+def _kdtree_query(tree: Any, q: tuple[int, float, float, float], k: int) -> list[int]:
+    # every point within _TIE_TOLERANCE of the k-th nearest chord distance; `worst` is a
+    # max-heap (negated) of the k smallest squared distances seen so far
+    qx, qy, qz = q[1], q[2], q[3]
+    worst: list[float] = []
+    limit = math.inf
+    found: list[tuple[float, int]] = []
+    stack = [(tree, 0.0)]
+    while stack:
+        node, bound = stack.pop()
+        if bound > limit:
+            continue
+        if isinstance(node, list):
+            for j, x, y, z in node:
+                d2 = (x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2
+                if d2 > limit:
+                    continue
+                found.append((d2, j))
+                if len(worst) < k:
+                    heapq.heappush(worst, -d2)
+                    if len(worst) == k:
+                        limit = _widen(-worst[0])
+                elif d2 < -worst[0]:
+                    heapq.heapreplace(worst, -d2)
+                    limit = _widen(-worst[0])
+            continue
+        axis, split, left, right = node
+        diff = q[axis] - split
+        near, far = (left, right) if diff < 0 else (right, left)
+        stack.append((far, max(bound, diff * diff)))
+        stack.append((near, bound))
+    return [j for d2, j in found if d2 <= limit]
+
+
+def _kdtree_query_many(
+    tree: Any,
+    k: int,
+    lats: list[float],
+    lons: list[float],
+    queries: list[tuple[int, float, float, float]],
+) -> list[list[int]]:
+    return [_pick_neighbors(q[0], _kdtree_query(tree, q, k), k, lats, lons) for q in queries]
+
+
+def _kdtree_knn(
+    xyz: list[tuple[float, float, float]],
+    k: int,
+    lats: list[float],
+    lons: list[float],
+    workers: int = 1,
+) -> list[list[int]]:
+    items = [(j, x, y, z) for j, (x, y, z) in enumerate(xyz)]
+    tree = _build_kdtree(list(items))
+    if workers <= 1:
+        return _kdtree_query_many(tree, k, lats, lons, items)
+    # queries are independent; each worker gets the tree once and a contiguous chunk
+    size = math.ceil(len(items) / workers)
+    chunks = [items[i : i + size] for i in range(0, len(items), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        query = partial(_kdtree_query_many, tree, k, lats, lons)
+        return [nn for chunk in pool.map(query, chunks) for nn in chunk]
+
+
 def _mean(vals: list[float]) -> float:
-    return sum(vals) / len(vals)
+    # fsum is exactly rounded, so the mean stays accurate on large inputs
+    return math.fsum(vals) / len(vals)
 
 
 def _sample_std(vals: list[float]) -> float:
     m = _mean(vals)
-    return math.sqrt(sum((v - m) ** 2 for v in vals) / (len(vals) - 1))
+    # deviations are already centered, so a plain C-level sum is accurate enough here
+    return math.sqrt(sum([(v - m) * (v - m) for v in vals]) / (len(vals) - 1))
 
 
-def _normal_sf(abs_z: float) -> float:
-    # survival function for standard normal
-    return 0.5 * math.erfc(abs_z / math.sqrt(2))
+_SQRT2 = math.sqrt(2)
 
 
 def classify_significance(z_score: float, p_value: float) -> str:
@@ -72,7 +216,29 @@ def classify_significance(z_score: float, p_value: float) -> str:
     return "Not Significant"
 
 
-def compute_gi_star_rows(
+# two-sided critical values for p = 0.01, 0.05 and 0.10: the smallest floats whose
+# erfc(|z| / sqrt(2)) p-value falls at or under the threshold, so bins match exactly
+_Z99 = 2.5758293035489013
+_Z95 = 1.9599639845400543
+_Z90 = 1.644853626951473
+
+
+def classify_from_z(z_score: float) -> str:
+    # same bins as classify_significance, without needing the p-value
+    abs_z = abs(z_score)
+    if abs_z >= _Z99:
+        return "Hot Spot 99%" if z_score > 0 else "Cold Spot 99%"
+    if abs_z >= _Z95:
+        return "Hot Spot 95%" if z_score > 0 else "Cold Spot 95%"
+    if abs_z >= _Z90:
+        return "Hot Spot 90%" if z_score > 0 else "Cold Spot 90%"
+    return "Not Significant"
+
+
+_GI_STAR_COLUMNS = ["gi_star_zscore", "gi_star_pvalue", "gi_bin"]
+
+
+def _gi_star_scores(
     rows: list[dict[str, str]],
     *,
     id_col: str,
@@ -80,83 +246,227 @@ def compute_gi_star_rows(
     lon_col: str,
     value_col: str,
     k_neighbors: int,
-) -> list[dict[str, Any]]:
+    workers: int = 1,
+) -> tuple[list[float], list[float], list[str]]:
+    # columnar Gi* output: (z-scores, p-values, bins), one entry per input row
     _validate_columns(rows, [id_col, lat_col, lon_col, value_col])
     if k_neighbors < 1:
         raise ValueError("k_neighbors must be >= 1")
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
     if len(rows) < 3:
         raise ValueError("At least 3 points are required")
 
-    points: list[tuple[float, float, float]] = []
-    for r in rows:
-        points.append((float(r[lat_col]), float(r[lon_col]), float(r[value_col])))
+    lats = [float(r[lat_col]) for r in rows]
+    lons = [float(r[lon_col]) for r in rows]
+    values = [float(r[value_col]) for r in rows]
 
-    n = len(points)
-    values = [v for _, _, v in points]
+    n = len(rows)
     xbar = _mean(values)
     s = _sample_std(values)
     if s == 0:
         raise ValueError("Input value column has no variance")
 
-    out: list[dict[str, Any]] = []
-    for i, (lat_i, lon_i, _) in enumerate(points):
-        dists = []
-        for j, (lat_j, lon_j, _) in enumerate(points):
-            dists.append((j, _haversine_km(lat_i, lon_i, lat_j, lon_j)))
-        dists.sort(key=lambda x: x[1])
-
-        k = min(k_neighbors + 1, n)
-        neighbor_ids = {idx for idx, _ in dists[:k]}
-
-        wij_sum = float(len(neighbor_ids))
-        wij_sq_sum = wij_sum
-        weighted_x_sum = sum(values[j] for j in neighbor_ids)
-
-        denom_term = ((n * wij_sq_sum) - (wij_sum ** 2)) / (n - 1)
-        denominator = s * math.sqrt(denom_term)
-        if denominator == 0:
-            raise ValueError("Encountered zero denominator in Gi* computation")
-
-        z = (weighted_x_sum - (xbar * wij_sum)) / denominator
-        p = 2 * _normal_sf(abs(z))
-
-        row = dict(rows[i])
+    xyz = _unit_vectors([math.radians(lat) for lat in lats], [math.radians(lon) for lon in lons])
+
+    k = min(k_neighbors + 1, n)
+    if n >= _KDTREE_MIN_POINTS:
+        neighbors = _kdtree_knn(xyz, k, lats, lons, workers=workers)
+    else:
+        neighbors = _brute_knn(xyz, k, lats, lons)
+    weighted_x_sums = [sum(map(values.__getitem__, nn)) for nn in neighbors]
+
+    # binary weights with exactly k neighbors (self included) per point, so
+    # sum(w_ij) == sum(w_ij^2) == k and the denominator is the same for every row
+    wij_sum = float(k)
+    denom_term = ((n * wij_sum) - (wij_sum ** 2)) / (n - 1)
+    denominator = s * math.sqrt(denom_term)
+    if denominator == 0:
+        raise ValueError("Encountered zero denominator in Gi* computation")
+    expected_sum = xbar * wij_sum
+
+    z_scores = [(weighted_x_sum - expected_sum) / denominator for weighted_x_sum in weighted_x_sums]
+    # two-sided p-value: 2 * P(Z > |z|) == erfc(|z| / sqrt(2))
+    erfc = math.erfc
+    p_values = [erfc(abs(z) / _SQRT2) for z in z_scores]
+    bins = [classify_from_z(z) for z in z_scores]
+    return z_scores, p_values, bins
+
+
+def _iter_gi_star_rows(
+    rows: list[dict[str, str]], z_scores: list[float], p_values: list[float], bins: list[str]
+) -> Iterator[dict[str, Any]]:
+    # rows are updated in place rather than copied; callers own a fresh list from _read_csv
+    for row, z, p, label in zip(rows, z_scores, p_values, bins):
         row["gi_star_zscore"] = f"{z:.6f}"
         row["gi_star_pvalue"] = f"{p:.6f}"
-        row["gi_bin"] = classify_significance(z, p)
-        out.append(row)
-    return out
+        row["gi_bin"] = label
+        yield row
 
 
-def _point_in_ring(point: tuple[float, float], ring: list[list[float]]) -> bool:
-    x, y = point
-    inside = False
-    for i in range(len(ring)):
-        x1, y1 = ring[i]
-        x2, y2 = ring[(i + 1) % len(ring)]
-        if ((y1 > y) != (y2 > y)) and (x < (x2 - x1) * (y - y1) / ((y2 - y1) or 1e-12) + x1):
-            inside = not inside
+def compute_gi_star_rows(
+    rows: list[dict[str, str]],
+    *,
+    id_col: str,
+    lat_col: str,
+    lon_col: str,
+    value_col: str,
+    k_neighbors: int,
+    workers: int = 1,
+) -> list[dict[str, Any]]:
+    # the Gi* columns are added to the input row dicts in place; pass copies to keep them
+    scores = _gi_star_scores(
+        rows,
+        id_col=id_col,
+        lat_col=lat_col,
+        lon_col=lon_col,
+        value_col=value_col,
+        k_neighbors=k_neighbors,
+        workers=workers,
+    )
+    return list(_iter_gi_star_rows(rows, *scores))
+
+
+_Edge = tuple[float, float, float, float, float, float]
+_Bbox = tuple[float, float, float, float]
+_GRID_MAX_CELLS_PER_POLYGON = 256
+
+
+def _ring_edges(ring: list[list[float]]) -> list[_Edge]:
+    # (y_min, y_max, x1, y1, dx, dy) per edge, including the closing edge back to the
+    # first vertex; horizontal edges never straddle a point's y and are dropped
+    pts = [(float(pt[0]), float(pt[1])) for pt in ring]
+    edges = []
+    for (x1, y1), (x2, y2) in zip(pts, pts[1:] + pts[:1]):
+        if y1 != y2:
+            edges.append((min(y1, y2), max(y1, y2), x1, y1, x2 - x1, y2 - y1))
+    return edges
+
+
+def _points_in_ring(xs: list[float], ys: list[float], edges: list[_Edge]) -> list[bool]:
+    # points must be sorted by y so each edge only visits the points inside its y-span
+    inside = [False] * len(ys)
+    for y_min, y_max, x1, y1, dx, dy in edges:
+        for j in range(bisect.bisect_left(ys, y_min), bisect.bisect_left(ys, y_max)):
+            # multiply before dividing: a precomputed dx / dy rounds differently and
+            # flips points that lie exactly on a diagonal edge
+            if xs[j] < dx * (ys[j] - y1) / dy + x1:
+                inside[j] = not inside[j]
     return inside
 
 
-def _point_in_polygon(point: tuple[float, float], polygon_coords: list[list[list[float]]]) -> bool:
-    # GeoJSON polygon: [outer_ring, hole1, ...]
-    if not _point_in_ring(point, polygon_coords[0]):
-        return False
-    for hole in polygon_coords[1:]:
-        if _point_in_ring(point, hole):
-            return False
-    return True
+def _points_in_polygon(xs: list[float], ys: list[float], rings: list[list[_Edge]]) -> list[bool]:
+    # rings as prepared by _ring_edges: [outer_ring, hole1, ...]
+    inside = _points_in_ring(xs, ys, rings[0])
+    for hole in rings[1:]:
+        in_hole = _points_in_ring(xs, ys, hole)
+        inside = [a and not b for a, b in zip(inside, in_hole)]
+    return inside
 
 
-def _point_in_geometry(point: tuple[float, float], geometry: dict[str, Any]) -> bool:
+def _geometry_parts(geometry: dict[str, Any]) -> list[tuple[_Bbox, list[list[_Edge]]]]:
+    # split a (Multi)Polygon into prepared polygons paired with their outer-ring bbox
     gtype = geometry.get("type")
     coords = geometry.get("coordinates")
     if gtype == "Polygon":
-        return _point_in_polygon(point, coords)
-    if gtype == "MultiPolygon":
-        return any(_point_in_polygon(point, poly) for poly in coords)
-    return False
+        polygons = [coords]
+    elif gtype == "MultiPolygon":
+        polygons = coords
+    else:
+        return []
+    parts = []
+    for polygon_coords in polygons:
+        if not polygon_coords or not polygon_coords[0]:
+            continue
+        xs = [pt[0] for pt in polygon_coords[0]]
+        ys = [pt[1] for pt in polygon_coords[0]]
+        rings = [_ring_edges(ring) for ring in polygon_coords]
+        parts.append(((min(xs), min(ys), max(xs), max(ys)), rings))
+    return parts
+
+
+def _build_grid_index(
+    bboxes: list[_Bbox],
+) -> tuple[Callable[[float, float], int], dict[int, list[int]], list[int]]:
+    # uniform grid with cells the size of the median polygon bbox diagonal, which a few
+    # huge features cannot inflate; each polygon is bucketed into every cell its bbox
+    # overlaps, in input order so first-match semantics are preserved. Polygons that
+    # would span more than _GRID_MAX_CELLS_PER_POLYGON cells go into the returned
+    # oversized list instead, which callers check alongside every cell.
+    diagonals = sorted(math.hypot(maxx - minx, maxy - miny) for minx, miny, maxx, maxy in bboxes)
+    cell_size = diagonals[len(diagonals) // 2] if diagonals else 0.0
+    if cell_size <= 0:
+        cell_size = 1.0
+    x0 = min((b[0] for b in bboxes), default=0.0)
+    y0 = min((b[1] for b in bboxes), default=0.0)
+    rows = math.floor((max((b[3] for b in bboxes), default=0.0) - y0) / cell_size) + 1
+
+    def cell_key(x: float, y: float) -> int:
+        # flat column-major key; y outside the grid can alias another cell, but such
+        # points lie outside every bbox and are rejected before any ring test
+        return math.floor((x - x0) / cell_size) * rows + math.floor((y - y0) / cell_size)
+
+    grid: dict[int, list[int]] = {}
+    oversized: list[int] = []
+    for idx, (minx, miny, maxx, maxy) in enumerate(bboxes):
+        ix_lo, ix_hi = math.floor((minx - x0) / cell_size), math.floor((maxx - x0) / cell_size)
+        iy_lo, iy_hi = math.floor((miny - y0) / cell_size), math.floor((maxy - y0) / cell_size)
+        if (ix_hi - ix_lo + 1) * (iy_hi - iy_lo + 1) > _GRID_MAX_CELLS_PER_POLYGON:
+            oversized.append(idx)
+            continue
+        for ix in range(ix_lo, ix_hi + 1):
+            for iy in range(iy_lo, iy_hi + 1):
+                grid.setdefault(ix * rows + iy, []).append(idx)
+    return cell_key, grid, oversized
+
+
+def _load_polygons(
+    geojson_path: Path, polygon_id_col: str
+) -> tuple[list[str], list[list[tuple[_Bbox, list[list[_Edge]]]]], list[_Bbox]]:
+    # only the prepared edges and bboxes outlive this call; the parsed GeoJSON tree
+    # (nested lists of coordinate pairs) is released before any points are processed
+    with geojson_path.open("r", encoding="utf-8") as f:
+        gj = json.load(f)
+
+    polygon_ids: list[str] = []
+    polygon_parts: list[list[tuple[_Bbox, list[list[_Edge]]]]] = []
+    bboxes: list[_Bbox] = []
+    for feat in gj.get("features", []):
+        props = feat.get("properties", {})
+        if polygon_id_col not in props:
+            continue
+        parts = _geometry_parts(feat.get("geometry", {}))
+        if not parts:
+            continue
+        polygon_ids.append(str(props[polygon_id_col]))
+        polygon_parts.append(parts)
+        bboxes.append(
+            (
+                min(b[0] for b, _ in parts),
+                min(b[1] for b, _ in parts),
+                max(b[2] for b, _ in parts),
+                max(b[3] for b, _ in parts),
+            )
+        )
+    return polygon_ids, polygon_parts, bboxes
+
+
+_SUMMARY_BIN_COLUMNS = (
+    "hotspot_99",
+    "hotspot_95",
+    "hotspot_90",
+    "coldspot_99",
+    "coldspot_95",
+    "coldspot_90",
+)
+_SUMMARY_BIN_CODES = {
+    "Hot Spot 99%": 0,
+    "Hot Spot 95%": 1,
+    "Hot Spot 90%": 2,
+    "Cold Spot 99%": 3,
+    "Cold Spot 95%": 4,
+    "Cold Spot 90%": 5,
+}
 
 
 def join_points_to_geojson(
@@ -166,97 +476,103 @@ def join_points_to_geojson(
     lat_col: str,
     lon_col: str,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-    with geojson_path.open("r", encoding="utf-8") as f:
-        gj = json.load(f)
+    polygon_ids, polygon_parts, bboxes = _load_polygons(geojson_path, polygon_id_col)
+    cell_key, grid, oversized = _build_grid_index(bboxes)
+
+    xs = [float(row[lon_col]) for row in point_rows]
+    ys = [float(row[lat_col]) for row in point_rows]
+    cell_points: dict[int, list[int]] = {}
+    for j, (x, y) in enumerate(zip(xs, ys)):
+        # nan/inf coordinates cannot be bucketed and are never inside a polygon
+        if not (math.isfinite(x) and math.isfinite(y)):
+            continue
+        cell_points.setdefault(cell_key(x, y), []).append(j)
+
+    # polygon-major within each cell: candidates are tried in feature order and a point
+    # leaves the pending set on its first hit
+    matched = [-1] * len(point_rows)
+    for cell, pending in cell_points.items():
+        candidates = grid.get(cell, [])
+        if oversized:
+            # both lists are in feature order, so the merge keeps first-match semantics
+            candidates = list(heapq.merge(candidates, oversized))
+        if not candidates:
+            continue
+        pending.sort(key=ys.__getitem__)
+        for idx in candidates:
+            for (minx, miny, maxx, maxy), rings in polygon_parts[idx]:
+                batch = [
+                    j
+                    for j in pending
+                    if matched[j] < 0 and minx <= xs[j] <= maxx and miny <= ys[j] <= maxy
+                ]
+                if not batch:
+                    continue
+                hits = _points_in_polygon([xs[j] for j in batch], [ys[j] for j in batch], rings)
+                for j, hit in zip(batch, hits):
+                    if hit:
+                        matched[j] = idx
+            pending = [j for j in pending if matched[j] < 0]
+            if not pending:
+                break
 
-    features = gj.get("features", [])
-    joined_rows: list[dict[str, Any]] = []
+    # summary slots are allocated in first-seen order of polygon ID ("" for unmatched);
+    # counts[slot] holds one counter per _SUMMARY_BIN_COLUMNS entry
+    slots: dict[str, int] = {}
+    slot_ids: list[str] = []
+    point_counts: list[int] = []
+    bin_counts: list[list[int]] = []
+    zscore_sums: list[float] = []
+    min_pvalues: list[float] = []
 
-    for row in point_rows:
-        point = (float(row[lon_col]), float(row[lat_col]))
-        matched_id = ""
-        for feat in features:
-            props = feat.get("properties", {})
-            geom = feat.get("geometry", {})
-            if polygon_id_col not in props:
-                continue
-            if _point_in_geometry(point, geom):
-                matched_id = str(props[polygon_id_col])
-                break
+    joined_rows: list[dict[str, Any]] = []
+    for row, idx in zip(point_rows, matched):
+        pid = polygon_ids[idx] if idx >= 0 else ""
         enriched = dict(row)
-        enriched[polygon_id_col] = matched_id
+        enriched[polygon_id_col] = pid
         joined_rows.append(enriched)
 
-    summary_map: dict[str, dict[str, Any]] = {}
-    for row in joined_rows:
-        pid = row[polygon_id_col]
-        if pid not in summary_map:
-            summary_map[pid] = {
-                polygon_id_col: pid,
-                "point_count": 0,
-                "hotspot_99": 0,
-                "hotspot_95": 0,
-                "hotspot_90": 0,
-                "coldspot_99": 0,
-                "coldspot_95": 0,
-                "coldspot_90": 0,
-                "zscore_sum": 0.0,
-                "min_pvalue": 1.0,
-            }
-        s = summary_map[pid]
-        s["point_count"] += 1
-        z = float(row["gi_star_zscore"])
-        p = float(row["gi_star_pvalue"])
-        s["zscore_sum"] += z
-        s["min_pvalue"] = min(s["min_pvalue"], p)
-
-        label = row["gi_bin"]
-        if label == "Hot Spot 99%":
-            s["hotspot_99"] += 1
-        elif label == "Hot Spot 95%":
-            s["hotspot_95"] += 1
-        elif label == "Hot Spot 90%":
-            s["hotspot_90"] += 1
-        elif label == "Cold Spot 99%":
-            s["coldspot_99"] += 1
-        elif label == "Cold Spot 95%":
-            s["coldspot_95"] += 1
-        elif label == "Cold Spot 90%":
-            s["coldspot_90"] += 1
+        slot = slots.get(pid)
+        if slot is None:
+            slot = slots[pid] = len(slot_ids)
+            slot_ids.append(pid)
+            point_counts.append(0)
+            bin_counts.append([0] * len(_SUMMARY_BIN_COLUMNS))
+            zscore_sums.append(0.0)
+            min_pvalues.append(1.0)
+        point_counts[slot] += 1
+        zscore_sums[slot] += float(row["gi_star_zscore"])
+        min_pvalues[slot] = min(min_pvalues[slot], float(row["gi_star_pvalue"]))
+        code = _SUMMARY_BIN_CODES.get(row["gi_bin"])
+        if code is not None:
+            bin_counts[slot][code] += 1
 
     summary_rows = []
-    for pid, s in summary_map.items():
-        count = s["point_count"]
-        summary_rows.append(
-            {
-                polygon_id_col: pid,
-                "point_count": count,
-                "hotspot_99": s["hotspot_99"],
-                "hotspot_95": s["hotspot_95"],
-                "hotspot_90": s["hotspot_90"],
-                "coldspot_99": s["coldspot_99"],
-                "coldspot_95": s["coldspot_95"],
-                "coldspot_90": s["coldspot_90"],
-                "mean_zscore": f"{(s['zscore_sum'] / count):.6f}" if count else "",
-                "min_pvalue": f"{s['min_pvalue']:.6f}" if count else "",
-            }
-        )
+    for slot, pid in enumerate(slot_ids):
+        count = point_counts[slot]
+        summary = {polygon_id_col: pid, "point_count": count}
+        summary.update(zip(_SUMMARY_BIN_COLUMNS, bin_counts[slot]))
+        summary["mean_zscore"] = f"{(zscore_sums[slot] / count):.6f}" if count else ""
+        summary["min_pvalue"] = f"{min_pvalues[slot]:.6f}" if count else ""
+        summary_rows.append(summary)
 
     return joined_rows, summary_rows
 
 
 def run_hotspot_command(args: argparse.Namespace) -> None:
     rows = _read_csv(Path(args.input_csv))
-    output = compute_gi_star_rows(
+    scores = _gi_star_scores(
         rows,
         id_col=args.id_col,
         lat_col=args.lat_col,
         lon_col=args.lon_col,
         value_col=args.value_col,
         k_neighbors=args.k_neighbors,
+        workers=args.workers,
     )
-    fieldnames = list(output[0].keys())
-    _write_csv(Path(args.output_csv), output, fieldnames)
+    # stream enriched rows straight to the writer instead of building the full list
+    fieldnames = list(rows[0].keys()) + [c for c in _GI_STAR_COLUMNS if c not in rows[0]]
+    _write_csv(Path(args.output_csv), _iter_gi_star_rows(rows, *scores), fieldnames)
     print(f"Wrote hotspot output: {args.output_csv}")
 
 
@@ -289,6 +605,7 @@ def build_parser() -> argparse.ArgumentParser:
     hotspot.add_argument("--lon-col", default="longitude")
     hotspot.add_argument("--value-col", default="value")
     hotspot.add_argument("--k-neighbors", type=int, default=8)
+    hotspot.add_argument("--workers", type=int, default=1, help="Processes for the neighbor search")
     hotspot.set_defaults(func=run_hotspot_command)
 
     join = subparsers.add_parser("join", help="Join hotspot results to GeoJSON polygons")
@@ -1,4 +1,23 @@
-from hotspot_analysis import compute_gi_star_rows
+import csv
+import json
+import math
+import random
+
+import pytest
+
+from hotspot_analysis import (
+    _brute_knn,
+    _build_grid_index,
+    _read_csv,
+    _write_csv,
+    _haversine_km,
+    _kdtree_knn,
+    _unit_vectors,
+    classify_from_z,
+    classify_significance,
+    compute_gi_star_rows,
+    join_points_to_geojson,
+)
 
 
 def test_compute_gi_star_outputs_expected_columns_and_classes():
@@ -34,3 +53,277 @@ def test_compute_gi_star_outputs_expected_columns_and_classes():
             "Not Significant",
         }
     )
+
+
+def test_read_csv_matches_dict_reader_on_ragged_rows(tmp_path):
+    path = tmp_path / "points.csv"
+    path.write_text(
+        "id,latitude,longitude,value,note\n"
+        "1,40,-75,1\n"
+        "\n"
+        "2,41,-74,2,a,extra1,extra2\n"
+        "3,42,-73,3,b\n"
+    )
+
+    with path.open(newline="", encoding="utf-8") as f:
+        expected = list(csv.DictReader(f))
+
+    assert _read_csv(path) == expected
+    assert _read_csv(path)[0]["note"] is None
+
+
+def test_write_csv_rejects_overlong_rows_instead_of_dropping_fields(tmp_path):
+    path = tmp_path / "points.csv"
+    path.write_text("id,latitude,longitude,value\n1,40,-75,1\n2,41,-74,2,EXTRA\n")
+    rows = _read_csv(path)
+
+    with pytest.raises(ValueError, match="fields not in fieldnames"):
+        _write_csv(tmp_path / "out.csv", rows, list(rows[0].keys()))
+
+
+def test_classify_from_z_matches_p_value_classification():
+    critical = [2.5758293035489013, 1.9599639845400543, 1.644853626951473]
+    edges = [math.nextafter(c, d) for c in critical for d in (0.0, 10.0)] + critical
+    for z in [i / 1000 for i in range(-4000, 4001)] + edges + [-e for e in edges]:
+        p = math.erfc(abs(z) / math.sqrt(2))
+        assert classify_from_z(z) == classify_significance(z, p)
+
+
+def test_kdtree_knn_matches_brute_force():
+    rng = random.Random(7)
+    lats = [40.0 + rng.random() for _ in range(300)]
+    lons = [-75.0 + rng.random() for _ in range(300)]
+    xyz = _unit_vectors([math.radians(v) for v in lats], [math.radians(v) for v in lons])
+
+    brute = _brute_knn(xyz, 9, lats, lons)
+    tree = _kdtree_knn(xyz, 9, lats, lons)
+
+    assert [sorted(nn) for nn in tree] == [sorted(nn) for nn in brute]
+
+
+def test_compute_gi_star_parallel_matches_serial():
+    rng = random.Random(11)
+    rows = [
+        {
+            "id": str(i),
+            "latitude": f"{40.0 + rng.random():.6f}",
+            "longitude": f"{-75.0 + rng.random():.6f}",
+            "value": f"{rng.gauss(10, 3):.3f}",
+        }
+        for i in range(200)
+    ]
+    kwargs = dict(
+        id_col="id", lat_col="latitude", lon_col="longitude", value_col="value", k_neighbors=8
+    )
+
+    serial = compute_gi_star_rows([dict(r) for r in rows], **kwargs)
+    parallel = compute_gi_star_rows([dict(r) for r in rows], workers=2, **kwargs)
+
+    assert parallel == serial
+
+
+def _haversine_neighbor_sets(lats, lons, k):
+    # reference ranking: stable sort by haversine distance, so ties go to the lowest index
+    n = len(lats)
+    return [
+        set(sorted(range(n), key=lambda j: _haversine_km(lats[i], lons[i], lats[j], lons[j]))[:k])
+        for i in range(n)
+    ]
+
+
+def test_knn_breaks_grid_ties_like_haversine_sort():
+    rng = random.Random(3)
+    cells = rng.sample([(a, b) for a in range(30) for b in range(30)], 300)
+    lats = [float(f"{40 + a * 0.01:.2f}") for a, _ in cells]
+    lons = [float(f"{-75 + b * 0.01:.2f}") for _, b in cells]
+    xyz = _unit_vectors([math.radians(v) for v in lats], [math.radians(v) for v in lons])
+
+    for k in (2, 4, 9):
+        expected = _haversine_neighbor_sets(lats, lons, k)
+        assert [set(nn) for nn in _kdtree_knn(xyz, k, lats, lons)] == expected
+        assert [set(nn) for nn in _brute_knn(xyz, k, lats, lons)] == expected
+
+
+def _reference_polygon_id(x, y, features):
+    # first feature whose outer ring contains (x, y), using the crossing-number test
+    # exactly as written in the original per-point join
+    for feat in features:
+        ring = feat["geometry"]["coordinates"][0]
+        inside = False
+        for i in range(len(ring)):
+            x1, y1 = ring[i]
+            x2, y2 = ring[(i + 1) % len(ring)]
+            if ((y1 > y) != (y2 > y)) and (x < (x2 - x1) * (y - y1) / ((y2 - y1) or 1e-12) + x1):
+                inside = not inside
+        if inside:
+            return feat["properties"]["GEOID"]
+    return ""
+
+
+def test_join_points_on_shared_diagonal_edges_match_reference(tmp_path):
+    # triangles with vertices on a 1/7 lattice share diagonal edges, and many of the
+    # 1/23 lattice points below sit exactly on those edges
+    rng = random.Random(5)
+    features = []
+    for i in range(30):
+        tri = [[rng.randint(0, 21) / 7, rng.randint(0, 21) / 7] for _ in range(3)]
+        features.append(
+            {
+                "type": "Feature",
+                "properties": {"GEOID": str(i)},
+                "geometry": {"type": "Polygon", "coordinates": [tri + [tri[0]]]},
+            }
+        )
+    path = tmp_path / "triangles.geojson"
+    collection = {"type": "FeatureCollection", "features": features}
+    path.write_text(json.dumps(collection), encoding="utf-8")
+
+    coords = [a * 3 / 69 for a in range(70)]
+    rows = [
+        {
+            "latitude": str(y),
+            "longitude": str(x),
+            "gi_star_zscore": "0.0",
+            "gi_star_pvalue": "1.0",
+            "gi_bin": "Not Significant",
+        }
+        for x in coords
+        for y in coords
+    ]
+
+    joined, _ = join_points_to_geojson(rows, path, "GEOID", "latitude", "longitude")
+
+    expected = [_reference_polygon_id(x, y, features) for x in coords for y in coords]
+    assert [r["GEOID"] for r in joined] == expected
+
+
+def test_join_points_to_geojson_handles_holes_multipolygons_and_misses(tmp_path):
+    square = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+    hole = [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]]
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"name": "no id"},
+                "geometry": {"type": "Polygon", "coordinates": [square]},
+            },
+            {
+                "type": "Feature",
+                "properties": {"GEOID": "A"},
+                "geometry": {"type": "Polygon", "coordinates": [square, hole]},
+            },
+            {
+                "type": "Feature",
+                "properties": {"GEOID": "B"},
+                "geometry": {
+                    "type": "MultiPolygon",
+                    "coordinates": [
+                        [[[3, 3], [7, 3], [7, 7], [3, 7], [3, 3]]],
+                        [[[20, 20], [21, 20], [21, 21], [20, 20]]],
+                    ],
+                },
+            },
+        ],
+    }
+    path = tmp_path / "polygons.geojson"
+    path.write_text(json.dumps(geojson), encoding="utf-8")
+
+    def point(x, y, z, label):
+        return {
+            "latitude": str(y),
+            "longitude": str(x),
+            "gi_star_zscore": z,
+            "gi_star_pvalue": "0.010000",
+            "gi_bin": label,
+        }
+
+    rows = [
+        point(1, 1, "3.000000", "Hot Spot 99%"),
+        point(5, 5, "-2.000000", "Cold Spot 95%"),
+        point(20.8, 20.2, "1.000000", "Not Significant"),
+        point(50, 50, "0.500000", "Not Significant"),
+        point(2, 8, "1.000000", "Hot Spot 99%"),
+    ]
+
+    joined, summary = join_points_to_geojson(rows, path, "GEOID", "latitude", "longitude")
+
+    assert [r["GEOID"] for r in joined] == ["A", "B", "B", "", "A"]
+    assert [s["GEOID"] for s in summary] == ["A", "B", ""]
+    assert summary[0]["point_count"] == 2
+    assert summary[0]["hotspot_99"] == 2
+    assert summary[0]["mean_zscore"] == "2.000000"
+    assert summary[1]["coldspot_95"] == 1
+
+
+def test_join_grid_stays_bounded_with_mixed_polygon_sizes(tmp_path):
+    features = []
+    bboxes = []
+
+    def add_square(geoid, x, y, size):
+        ring = [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+        features.append(
+            {
+                "type": "Feature",
+                "properties": {"GEOID": geoid},
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            }
+        )
+        bboxes.append((x, y, x + size, y + size))
+
+    # 50 block-group-sized squares with one 20 degree square in the middle of the list
+    for i in range(50):
+        if i == 25:
+            add_square("BIG", 0, 0, 20)
+        add_square(f"S{i}", i * 0.02, 0, 0.01)
+    path = tmp_path / "polygons.geojson"
+    collection = {"type": "FeatureCollection", "features": features}
+    path.write_text(json.dumps(collection), encoding="utf-8")
+
+    _, grid, oversized = _build_grid_index(bboxes)
+    assert sum(len(v) for v in grid.values()) <= 4 * len(bboxes)
+    assert oversized == [25]
+
+    rows = [
+        {
+            "latitude": "0.005",
+            "longitude": str(x),
+            "gi_star_zscore": "0.0",
+            "gi_star_pvalue": "1.0",
+            "gi_bin": "Not Significant",
+        }
+        for x in (0.005, 0.485, 0.505, 0.995, 10.0, 25.0)
+    ]
+    joined, _ = join_points_to_geojson(rows, path, "GEOID", "latitude", "longitude")
+
+    # features before BIG win over it; BIG wins over the squares listed after it
+    assert [r["GEOID"] for r in joined] == ["S0", "S24", "BIG", "BIG", "BIG", ""]
+
+
+def test_join_leaves_non_finite_points_unmatched(tmp_path):
+    ring = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+    feature = {
+        "type": "Feature",
+        "properties": {"GEOID": "A"},
+        "geometry": {"type": "Polygon", "coordinates": [ring]},
+    }
+    path = tmp_path / "polygons.geojson"
+    collection = {"type": "FeatureCollection", "features": [feature]}
+    path.write_text(json.dumps(collection), encoding="utf-8")
+
+    coords = [("5", "5"), ("nan", "5"), ("5", "nan"), ("inf", "5"), ("5", "-inf")]
+    rows = [
+        {
+            "latitude": lat,
+            "longitude": lon,
+            "gi_star_zscore": "0.0",
+            "gi_star_pvalue": "1.0",
+            "gi_bin": "Not Significant",
+        }
+        for lat, lon in coords
+    ]
+
+    joined, summary = join_points_to_geojson(rows, path, "GEOID", "latitude", "longitude")
+
+    assert [r["GEOID"] for r in joined] == ["A", "", "", "", ""]
+    assert [(s["GEOID"], s["point_count"]) for s in summary] == [("A", 1), ("", 4)]